@@ -1,9 +1,15 @@
-import yfinance as yf
-import matplotlib.pyplot as plt
+import os
+import re
+import sys
 import pandas as pd
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
+# yfinance (~150 ms) e matplotlib.pyplot (~400 ms) são importados sob
+# demanda dentro das funções que os usam: invocações que só precisam dos
+# cálculos (variação, janelas) não pagam o custo de import
+
 # Importar módulo de renda fixa brasileira
 try:
     from renda_fixa_br import obter_ativo_renda_fixa
@@ -12,6 +18,69 @@ except ImportError:
     RENDA_FIXA_DISPONIVEL = False
     print("⚠️  Módulo de renda fixa não disponível")
 
+# Cache HTTP opcional: requisições repetidas ao Yahoo Finance (mesmo
+# ticker e período) são servidas do disco em vez de irem à rede.
+# Desative com a variável de ambiente YF_CACHE=0
+try:
+    import requests_cache
+    if os.environ.get('YF_CACHE', '1') != '0':
+        _sessao_yf = requests_cache.CachedSession(
+            '.yfcache',
+            expire_after=timedelta(hours=6),
+            allowable_methods=('GET', 'POST')
+        )
+        _sessao_yf.headers['User-Agent'] = (
+            'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 '
+            '(KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36'
+        )
+    else:
+        _sessao_yf = None
+except ImportError:
+    _sessao_yf = None
+
+# Numba é opcional: quando instalado, o kernel de detecção de blocos
+# contíguos é compilado para código de máquina; sem ele, usa-se o
+# caminho NumPy equivalente
+try:
+    from numba import njit
+    NUMBA_DISPONIVEL = True
+except ImportError:
+    NUMBA_DISPONIVEL = False
+
+# Erros do Yahoo Finance que não melhoram com retentativa (ticker
+# inexistente, removido ou sem dados)
+_ERRO_PERMANENTE = re.compile(r'404|not found|delisted|no data found', re.IGNORECASE)
+
+def _resolver_dir_saida(candidatos=('/mnt/user-data/outputs/', './')):
+    """
+    Devolve o primeiro diretório gravável entre os candidatos
+
+    Resolver o destino antes do savefig garante uma única serialização
+    da figura, em vez de tentar salvar (e re-renderizar) em cada caminho.
+    """
+    for caminho in candidatos:
+        try:
+            os.makedirs(caminho, exist_ok=True)
+            if os.access(caminho, os.W_OK):
+                return caminho
+        except OSError:
+            continue
+    return None
+
+def _downcast_precos(dados):
+    """
+    Converte as colunas de preço para float32
+
+    Para plotagem e comparação de variações, precisão simples (~7
+    dígitos significativos) é suficiente e reduz à metade o tráfego de
+    memória de todas as operações seguintes sobre os preços.
+    """
+    colunas_preco = [c for c in ['Open', 'High', 'Low', 'Close', 'Adj Close']
+                     if c in dados.columns]
+    if colunas_preco:
+        dados[colunas_preco] = dados[colunas_preco].astype(np.float32, copy=False)
+    return dados
+
 def obter_dados_ativo(ticker, data_inicio, data_fim):
     """
     Obtém dados históricos de um ativo financeiro
@@ -24,6 +93,9 @@ def obter_dados_ativo(ticker, data_inicio, data_fim):
     Returns:
         DataFrame com os dados históricos
     """
+    # Import tardio: resolvido em sys.modules a partir da segunda chamada
+    import yfinance as yf
+
     # Verificar se é ativo de renda fixa brasileira
     if ticker.startswith('RF-'):
         if not RENDA_FIXA_DISPONIVEL:
@@ -50,21 +122,25 @@ def obter_dados_ativo(ticker, data_inicio, data_fim):
                     start=data_inicio, 
                     end=data_fim, 
                     progress=False,
-                    timeout=30
+                    timeout=30,
+                    session=_sessao_yf
                 )
                 
                 if not dados.empty:
                     print(f"  ✓ Dados obtidos com sucesso!")
                     print(f"    Período: {dados.index[0].strftime('%d/%m/%Y')} a {dados.index[-1].strftime('%d/%m/%Y')}")
                     print(f"    Total de {len(dados)} dias de dados")
-                    return dados
+                    return _downcast_precos(dados)
                     
             except Exception as e:
                 ultimo_erro = str(e)
+                # Erro determinístico: retentar só desperdiçaria tempo
+                if _ERRO_PERMANENTE.search(ultimo_erro):
+                    raise
                 if tentativa < tentativas - 1:
                     print(f"  ⚠️  Tentativa {tentativa + 1} falhou, tentando novamente...")
                     import time
-                    time.sleep(2)  # Espera 2 segundos antes de tentar novamente
+                    time.sleep(2 ** tentativa)  # Backoff exponencial: 1s, 2s...
                     continue
                 else:
                     break
@@ -95,73 +171,224 @@ def obter_dados_ativo(ticker, data_inicio, data_fim):
         else:
             raise ValueError(f"❌ Erro ao obter dados para '{ticker}': {erro_msg}")
 
-def converter_usd_para_brl(dados_usd, data_inicio, data_fim):
+def obter_dados_ativos_batch(tickers, data_inicio, data_fim):
+    """
+    Obtém dados históricos de vários ativos em uma única chamada
+
+    Ativos RF-* são delegados ao módulo de renda fixa; os demais são
+    baixados do Yahoo Finance em uma única requisição multi-ticker
+    (threads=True), evitando uma ida à rede por ativo. Quando algum
+    ticker termina em -USD, o par BRL=X entra no mesmo lote para ser
+    reaproveitado na conversão cambial.
+
+    Args:
+        tickers: Lista de símbolos (ex: ['BTC-USD', '^BVSP', 'RF-CDI'])
+        data_inicio: Data inicial (datetime)
+        data_fim: Data final (datetime)
+
+    Returns:
+        Dict {ticker: DataFrame}, incluindo 'BRL=X' quando aplicável
+    """
+    resultado = {}
+    rf_tickers = [t for t in tickers if t.startswith('RF-')]
+    yahoo_tickers = [t for t in tickers if not t.startswith('RF-')]
+
+    if rf_tickers:
+        # As buscas de renda fixa (BCB) são independentes do lote Yahoo:
+        # despachá-las em threads sobrepõe as esperas de rede dos dois
+        # caminhos (o download libera o GIL durante o I/O HTTP)
+        with ThreadPoolExecutor(max_workers=len(rf_tickers)) as executor:
+            futuros_rf = {
+                ticker: executor.submit(obter_dados_ativo, ticker, data_inicio, data_fim)
+                for ticker in rf_tickers
+            }
+            if yahoo_tickers:
+                resultado.update(_baixar_lote_yahoo(yahoo_tickers, data_inicio, data_fim))
+            for ticker, futuro in futuros_rf.items():
+                resultado[ticker] = futuro.result()
+    elif yahoo_tickers:
+        resultado.update(_baixar_lote_yahoo(yahoo_tickers, data_inicio, data_fim))
+
+    return resultado
+
+def _baixar_lote_yahoo(yahoo_tickers, data_inicio, data_fim):
+    """
+    Baixa o grupo de tickers do Yahoo Finance em uma única requisição
+
+    Returns:
+        Dict {ticker: DataFrame}, incluindo 'BRL=X' quando aplicável
+    """
+    # Import tardio: resolvido em sys.modules a partir da segunda chamada
+    import yfinance as yf
+
+    resultado = {}
+
+    # Incluir o câmbio no mesmo lote quando houver ativo em USD
+    tickers_download = list(yahoo_tickers)
+    fx_auxiliar = None
+    if any(t.endswith('-USD') for t in yahoo_tickers) and 'BRL=X' not in tickers_download:
+        fx_auxiliar = 'BRL=X'
+        tickers_download.append(fx_auxiliar)
+
+    if len(tickers_download) == 1:
+        # Um único ticker: usar o caminho normal (com retentativas)
+        resultado[tickers_download[0]] = obter_dados_ativo(tickers_download[0], data_inicio, data_fim)
+        return resultado
+
+    print(f"  Baixando em lote: {', '.join(tickers_download)}...")
+    try:
+        lote = yf.download(
+            " ".join(tickers_download),
+            start=data_inicio,
+            end=data_fim,
+            group_by='ticker',
+            threads=True,
+            progress=False,
+            timeout=30,
+            session=_sessao_yf
+        )
+    except Exception as e:
+        print(f"  ⚠️  Download em lote falhou ({str(e)}), baixando individualmente...")
+        lote = pd.DataFrame()
+
+    for ticker in tickers_download:
+        dados = pd.DataFrame()
+        if not lote.empty and ticker in lote.columns.get_level_values(0):
+            dados = lote[ticker].dropna(how='all')
+
+        if dados.empty:
+            if ticker == fx_auxiliar:
+                # O câmbio foi adicionado por conveniência: se nem o
+                # fallback individual conseguir, seguir sem ele — a
+                # conversão USD/BRL tem seu próprio plano B (taxa fixa)
+                try:
+                    dados = obter_dados_ativo(ticker, data_inicio, data_fim)
+                except Exception as e:
+                    print(f"  ⚠️  Câmbio {ticker} indisponível ({str(e)}); "
+                          f"a conversão usará a taxa de fallback")
+                    continue
+            else:
+                # Fallback individual preserva as retentativas e mensagens de erro
+                dados = obter_dados_ativo(ticker, data_inicio, data_fim)
+        else:
+            print(f"  ✓ {ticker}: {len(dados)} dias de dados")
+            dados = _downcast_precos(dados)
+
+        resultado[ticker] = dados
+
+    return resultado
+
+# Memoização da série de câmbio alinhada: os dois ativos de uma mesma
+# análise compartilham o download do BRL=X e a passada de reindex/ffill
+_fx_cache = {}
+
+def _obter_fx_alinhada(index, data_inicio, data_fim, cambio=None):
+    """
+    Obtém a série de câmbio USD/BRL alinhada ao índice fornecido
+
+    Args:
+        index: DatetimeIndex dos dados em USD
+        data_inicio: Data inicial (datetime)
+        data_fim: Data final (datetime)
+        cambio: DataFrame do par BRL=X já baixado (opcional)
+
+    Returns:
+        Series alinhada ao índice, ou None se não houver taxas
+    """
+    # Import tardio: resolvido em sys.modules a partir da segunda chamada
+    import yfinance as yf
+
+    chave = None
+    if cambio is None and len(index) > 0:
+        chave = (
+            data_inicio.date() if data_inicio is not None else None,
+            data_fim.date() if data_fim is not None else None,
+            index[0], index[-1], len(index)
+        )
+        if chave in _fx_cache:
+            print("  ✓ Taxas de câmbio reaproveitadas da análise atual")
+            return _fx_cache[chave]
+
+    if cambio is None:
+        print("  Obtendo taxas de câmbio USD/BRL...")
+
+        # BRL=X é o par USD/BRL no Yahoo Finance
+        cambio = yf.download('BRL=X', start=data_inicio, end=data_fim, progress=False, timeout=30, session=_sessao_yf)
+
+    if cambio.empty:
+        return None
+
+    # Extrair a série de taxas de câmbio
+    if isinstance(cambio['Close'], pd.DataFrame):
+        # Se for DataFrame com múltiplas colunas, pega a primeira
+        taxa_cambio = cambio['Close'].iloc[:, 0]
+    else:
+        # Se for Series, usa diretamente
+        taxa_cambio = cambio['Close']
+
+    # Criar Series com índice correto para evitar warnings; float32
+    # acompanha o dtype das colunas de preço já rebaixadas
+    taxa_cambio = pd.Series(taxa_cambio.values.astype(np.float32, copy=False),
+                            index=taxa_cambio.index)
+
+    # Reindexar para as datas dos dados USD usando forward fill
+    taxa_cambio_alinhada = taxa_cambio.reindex(index)
+    taxa_cambio_alinhada = taxa_cambio_alinhada.ffill()  # forward fill
+
+    # Se ainda houver NaNs no início, fazer backward fill
+    taxa_cambio_alinhada = taxa_cambio_alinhada.bfill()
+
+    if chave is not None:
+        _fx_cache[chave] = taxa_cambio_alinhada
+
+    return taxa_cambio_alinhada
+
+def converter_usd_para_brl(dados_usd, data_inicio, data_fim, cambio=None):
     """
     Converte dados de USD para BRL usando taxa de câmbio histórica
-    
+
     Args:
         dados_usd: DataFrame com dados em USD
         data_inicio: Data inicial (datetime)
         data_fim: Data final (datetime)
-    
+        cambio: DataFrame do par BRL=X já baixado (opcional); quando
+            omitido, as taxas são buscadas no Yahoo Finance
+
     Returns:
         DataFrame com dados convertidos para BRL
     """
+    # Import tardio: resolvido em sys.modules a partir da segunda chamada
+    import yfinance as yf
+
     try:
-        print("  Obtendo taxas de câmbio USD/BRL...")
-        
-        # BRL=X é o par USD/BRL no Yahoo Finance
-        cambio = yf.download('BRL=X', start=data_inicio, end=data_fim, progress=False, timeout=30)
-        
-        if cambio.empty:
+        taxa_cambio_alinhada = _obter_fx_alinhada(dados_usd.index, data_inicio, data_fim, cambio=cambio)
+
+        if taxa_cambio_alinhada is None:
             print("  ⚠️  Não foi possível obter taxas de câmbio, usando última taxa conhecida")
             # Tentar obter apenas a última taxa
-            cambio_atual = yf.download('BRL=X', period='1d', progress=False, timeout=30)
+            cambio_atual = yf.download('BRL=X', period='1d', progress=False, timeout=30, session=_sessao_yf)
             if not cambio_atual.empty:
                 taxa_fixa = float(cambio_atual['Close'].iloc[-1])
                 print(f"  Usando taxa fixa: R$ {taxa_fixa:.2f} por USD")
                 dados_brl = dados_usd.copy()
-                # Multiplicar coluna por coluna para evitar erros de indexação
-                for col in dados_brl.columns:
-                    if col in ['Open', 'High', 'Low', 'Close', 'Adj Close']:
-                        dados_brl[col] = dados_brl[col] * taxa_fixa
+                colunas_preco = [c for c in ['Open', 'High', 'Low', 'Close', 'Adj Close']
+                                 if c in dados_brl.columns]
+                dados_brl[colunas_preco] = dados_brl[colunas_preco].mul(taxa_fixa)
                 return dados_brl
             else:
                 raise ValueError("Não foi possível obter taxas de câmbio")
-        
+
         print("  ✓ Taxas de câmbio obtidas!")
-        
+
         # Criar cópia dos dados
         dados_brl = dados_usd.copy()
-        
-        # Extrair a série de taxas de câmbio
-        if isinstance(cambio['Close'], pd.DataFrame):
-            # Se for DataFrame com múltiplas colunas, pega a primeira
-            taxa_cambio = cambio['Close'].iloc[:, 0]
-        else:
-            # Se for Series, usa diretamente
-            taxa_cambio = cambio['Close']
-        
-        # Criar Series com índice correto para evitar warnings
-        taxa_cambio = pd.Series(taxa_cambio.values, index=taxa_cambio.index)
-        
-        # Reindexar para as datas dos dados USD usando forward fill
-        taxa_cambio_alinhada = taxa_cambio.reindex(dados_usd.index)
-        taxa_cambio_alinhada = taxa_cambio_alinhada.ffill()  # forward fill
-        
-        # Se ainda houver NaNs no início, fazer backward fill
-        taxa_cambio_alinhada = taxa_cambio_alinhada.bfill()
-        
-        # Converter cada coluna de preço
-        colunas_preco = ['Open', 'High', 'Low', 'Close', 'Adj Close']
-        for col in colunas_preco:
-            if col in dados_brl.columns:
-                # Verificar se a coluna é DataFrame ou Series
-                if isinstance(dados_brl[col], pd.DataFrame):
-                    dados_brl[col] = dados_brl[col].iloc[:, 0] * taxa_cambio_alinhada
-                else:
-                    dados_brl[col] = dados_brl[col] * taxa_cambio_alinhada
-        
+
+        # Converter todas as colunas de preço em uma única multiplicação
+        # vetorizada (broadcast da taxa pelas linhas)
+        colunas_preco = [c for c in ['Open', 'High', 'Low', 'Close', 'Adj Close']
+                         if c in dados_brl.columns]
+        dados_brl[colunas_preco] = dados_brl[colunas_preco].mul(taxa_cambio_alinhada, axis=0)
+
         taxa_media = float(taxa_cambio_alinhada.mean())
         print(f"  ✓ Conversão concluída! Taxa média: R$ {taxa_media:.2f}")
         
@@ -196,10 +423,17 @@ def calcular_variacao_percentual(dados):
         if not isinstance(coluna_close, pd.Series):
             coluna_close = pd.Series(coluna_close)
         
-        preco_inicial = float(coluna_close.iloc[0])
-        variacao = ((coluna_close - preco_inicial) / preco_inicial) * 100
-        
-        return variacao
+        # Operar no ndarray evita os alinhamentos de índice intermediários
+        # do pandas; multiplicar pelo recíproco dispensa a divisão por
+        # elemento. O dtype de entrada (float32 vindo do download) é
+        # preservado para não dobrar o tráfego de memória
+        valores = np.asarray(coluna_close.values)
+        if not np.issubdtype(valores.dtype, np.floating):
+            valores = valores.astype(np.float64)
+        preco_inicial = valores[0]
+        variacao = (valores - preco_inicial) * (100.0 / preco_inicial)
+
+        return pd.Series(variacao, index=coluna_close.index)
     else:
         raise ValueError("DataFrame não contém coluna 'Close'")
 
@@ -227,77 +461,136 @@ def calcular_retorno_janela(dados, janela_meses):
         # Calcular retornos para janela móvel
         # Aproximadamente 21 dias úteis por mês
         dias_janela = janela_meses * 21
-        
-        retornos = []
-        datas = []
-        
-        for i in range(len(coluna_close) - dias_janela):
-            preco_inicial = float(coluna_close.iloc[i])
-            preco_final = float(coluna_close.iloc[i + dias_janela])
-            retorno = ((preco_final - preco_inicial) / preco_inicial) * 100
-            retornos.append(retorno)
-            datas.append(coluna_close.index[i + dias_janela])
-        
-        return pd.Series(retornos, index=datas)
+
+        # pct_change faz o deslocamento e a divisão em uma primitiva C do
+        # pandas; o dropna descarta as primeiras posições sem janela completa
+        return coluna_close.pct_change(periods=dias_janela).mul(100.0).dropna()
     else:
         raise ValueError("DataFrame não contém coluna 'Close'")
 
-def encontrar_janelas_superacao(retornos1, retornos2, janela_meses):
+def _encontrar_blocos_kernel(mascara):
+    """
+    Varredura em passada única que localiza blocos contíguos de 1s
+
+    Recebe a máscara como uint8 e devolve (inicios, fins); quando o
+    numba está instalado esta função é compilada com @njit.
+    """
+    n = mascara.size
+    inicios = np.empty(n, dtype=np.int64)
+    fins = np.empty(n, dtype=np.int64)
+    total = 0
+    dentro = False
+    for i in range(n):
+        if mascara[i]:
+            if not dentro:
+                inicios[total] = i
+                dentro = True
+        elif dentro:
+            fins[total] = i - 1
+            total += 1
+            dentro = False
+    if dentro:
+        fins[total] = n - 1
+        total += 1
+    return inicios[:total], fins[:total]
+
+if NUMBA_DISPONIVEL:
+    _encontrar_blocos_kernel = njit(cache=True)(_encontrar_blocos_kernel)
+
+def _janelas_superacao_kernel(valores1, valores2):
+    """
+    Comparação e detecção de blocos fundidas em uma única passada
+
+    Equivale a _encontrar_blocos(valores2 > valores1), mas sem
+    materializar a máscara booleana intermediária; compilada com @njit
+    quando o numba está instalado.
+    """
+    n = valores1.size
+    inicios = np.empty(n, dtype=np.int64)
+    fins = np.empty(n, dtype=np.int64)
+    total = 0
+    dentro = False
+    for i in range(n):
+        if valores2[i] > valores1[i]:
+            if not dentro:
+                inicios[total] = i
+                dentro = True
+        elif dentro:
+            fins[total] = i - 1
+            total += 1
+            dentro = False
+    if dentro:
+        fins[total] = n - 1
+        total += 1
+    return inicios[:total], fins[:total]
+
+if NUMBA_DISPONIVEL:
+    _janelas_superacao_kernel = njit(cache=True, nogil=True)(_janelas_superacao_kernel)
+
+def _encontrar_blocos(mascara):
+    """
+    Encontra blocos contíguos de True em um array booleano
+
+    Args:
+        mascara: np.ndarray booleano
+
+    Returns:
+        Tupla (inicios, fins) com arrays de posições do primeiro e
+        último elemento de cada bloco
+    """
+    if NUMBA_DISPONIVEL:
+        return _encontrar_blocos_kernel(np.ascontiguousarray(mascara, dtype=np.uint8))
+
+    # Acolchoa com False nas bordas para detectar transições também
+    # no início e no fim do array
+    acolchoado = np.r_[False, mascara, False]
+    transicoes = np.diff(acolchoado.astype(np.int8))
+    inicios = np.where(transicoes == 1)[0]
+    fins = np.where(transicoes == -1)[0] - 1
+    return inicios, fins
+
+def encontrar_janelas_superacao(retornos1, retornos2, janela_meses, retornos_alinhados=None):
     """
     Identifica janelas onde ativo2 superou ativo1
-    
+
     Args:
         retornos1: Series com retornos do ativo 1
         retornos2: Series com retornos do ativo 2
         janela_meses: Tamanho da janela em meses
-    
+        retornos_alinhados: DataFrame com as duas séries já alinhadas
+            (primeira coluna = ativo 1); quando fornecido, evita repetir
+            o concat/dropna que o chamador já fez
+
     Returns:
         Lista de tuplas (data_inicio, data_fim, retorno_ativo1, retorno_ativo2)
     """
-    # Alinhar os índices
-    retornos_alinhados = pd.DataFrame({
-        'ativo1': retornos1,
-        'ativo2': retornos2
-    }).dropna()
-    
+    # Alinhar os índices (apenas se o chamador ainda não alinhou)
+    if retornos_alinhados is None:
+        retornos_alinhados = pd.concat([
+            retornos1.rename('ativo1'),
+            retornos2.rename('ativo2')
+        ], axis=1).dropna()
+
     if retornos_alinhados.empty:
         return []
-    
-    # Encontrar onde ativo2 > ativo1
-    superacao = retornos_alinhados['ativo2'] > retornos_alinhados['ativo1']
-    
-    janelas = []
-    em_superacao = False
-    inicio_idx = None
-    
-    dias_janela = janela_meses * 21
-    
-    for i, (data, valor) in enumerate(superacao.items()):
-        if valor and not em_superacao:
-            # Início de período de superação
-            em_superacao = True
-            inicio_idx = i
-        elif not valor and em_superacao:
-            # Fim de período de superação
-            em_superacao = False
-            if inicio_idx is not None:
-                # A data de início da janela é aproximadamente janela_meses antes da data de fim do retorno
-                data_inicio = retornos_alinhados.index[inicio_idx]
-                data_fim = data  # data atual (fim da superação)
-                ret1 = retornos_alinhados.iloc[i-1]['ativo1']
-                ret2 = retornos_alinhados.iloc[i-1]['ativo2']
-                janelas.append((data_inicio, data_fim, ret1, ret2))
-            inicio_idx = None
-    
-    # Se terminou ainda em superação
-    if em_superacao and inicio_idx is not None:
-        data_inicio = retornos_alinhados.index[inicio_idx]
-        data_fim = retornos_alinhados.index[-1]
-        ret1 = retornos_alinhados.iloc[-1]['ativo1']
-        ret2 = retornos_alinhados.iloc[-1]['ativo2']
-        janelas.append((data_inicio, data_fim, ret1, ret2))
-    
-    return janelas
+
+    # Encontrar onde ativo2 > ativo1 e detectar os blocos contíguos.
+    # Com numba, o kernel fundido compara e varre os blocos numa única
+    # passada em código de máquina, sem a máscara intermediária
+    valores1 = retornos_alinhados.iloc[:, 0].to_numpy()
+    valores2 = retornos_alinhados.iloc[:, 1].to_numpy()
+    if NUMBA_DISPONIVEL:
+        inicios, fins = _janelas_superacao_kernel(
+            np.ascontiguousarray(valores1, dtype=np.float64),
+            np.ascontiguousarray(valores2, dtype=np.float64)
+        )
+    else:
+        inicios, fins = _encontrar_blocos(valores2 > valores1)
+
+    datas_inicio = retornos_alinhados.index[inicios]
+    datas_fim = retornos_alinhados.index[fins]
+
+    return list(zip(datas_inicio, datas_fim, valores1[fins], valores2[fins]))
 
 def encontrar_periodos_superacao(var_ativo1, var_ativo2):
     """
@@ -311,37 +604,25 @@ def encontrar_periodos_superacao(var_ativo1, var_ativo2):
         Lista de tuplas (data_inicio, data_fim, dias)
     """
     # Alinha os dados por índice (datas)
-    df_comparacao = pd.DataFrame({
-        'ativo1': var_ativo1,
-        'ativo2': var_ativo2
-    }).dropna()
-    
-    # Identifica onde ativo2 está melhor
-    ativo2_melhor = df_comparacao['ativo2'] > df_comparacao['ativo1']
-    
-    periodos = []
-    inicio = None
-    
-    for i, (data, valor) in enumerate(ativo2_melhor.items()):
-        if valor and inicio is None:
-            # Início de um período de superação
-            inicio = data
-        elif not valor and inicio is not None:
-            # Fim de um período de superação
-            fim = df_comparacao.index[i-1]
-            dias = (fim - inicio).days + 1
-            periodos.append((inicio, fim, dias))
-            inicio = None
-    
-    # Se terminou ainda em superação
-    if inicio is not None:
-        fim = df_comparacao.index[-1]
-        dias = (fim - inicio).days + 1
-        periodos.append((inicio, fim, dias))
-    
-    return periodos
-
-def plotar_comparacao(ticker1, ticker2, data_inicio, data_fim, autoria=""):
+    df_comparacao = pd.concat([
+        var_ativo1.rename('ativo1'),
+        var_ativo2.rename('ativo2')
+    ], axis=1).dropna()
+
+    if df_comparacao.empty:
+        return []
+
+    # Identifica onde ativo2 está melhor e detecta os blocos contíguos
+    ativo2_melhor = df_comparacao['ativo2'].to_numpy() > df_comparacao['ativo1'].to_numpy()
+    inicios, fins = _encontrar_blocos(ativo2_melhor)
+
+    datas_inicio = df_comparacao.index[inicios]
+    datas_fim = df_comparacao.index[fins]
+    dias = (datas_fim - datas_inicio).days + 1
+
+    return list(zip(datas_inicio, datas_fim, dias))
+
+def plotar_comparacao(ticker1, ticker2, data_inicio, data_fim, autoria="", mostrar=None, dpi=300):
     """
     Plota gráfico comparativo de dois ativos
     
@@ -351,29 +632,42 @@ def plotar_comparacao(ticker1, ticker2, data_inicio, data_fim, autoria=""):
         data_inicio: Data inicial (datetime)
         data_fim: Data final (datetime)
         autoria: Nome do autor do gráfico (opcional)
+        mostrar: Exibir o gráfico na tela; por padrão, apenas quando o
+            backend do matplotlib for interativo
+        dpi: Resolução do arquivo salvo (use 150 para fluxos apenas de
+            tela; 300 para publicação)
     """
-    print(f"Obtendo dados para {ticker1}...")
-    dados1 = obter_dados_ativo(ticker1, data_inicio, data_fim)
-    
+    # Imports tardios do matplotlib: só os caminhos que plotam pagam o custo
+    import matplotlib
+    if not os.environ.get('MPLBACKEND') and sys.platform.startswith('linux') and not os.environ.get('DISPLAY'):
+        # Em ambientes sem display, o backend Agg evita instanciar GUI
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import matplotlib.dates as mdates
+    from matplotlib.collections import PatchCollection
+    from matplotlib.patches import Rectangle
+
+    print(f"Obtendo dados para {ticker1} e {ticker2}...")
+    lote = obter_dados_ativos_batch([ticker1, ticker2], data_inicio, data_fim)
+    dados1 = lote[ticker1]
+    dados2 = lote[ticker2]
+    cambio = lote.get('BRL=X')
+
     # Verificar se precisa converter para BRL
     if ticker1.endswith('-USD'):
         print(f"  💱 Detectado ativo em USD, convertendo para BRL...")
-        dados1 = converter_usd_para_brl(dados1, data_inicio, data_fim)
+        dados1 = converter_usd_para_brl(dados1, data_inicio, data_fim, cambio=cambio)
         ticker1_display = ticker1.replace('-USD', '-BRL*')
     else:
         ticker1_display = ticker1
-    
-    print(f"\nObtendo dados para {ticker2}...")
-    dados2 = obter_dados_ativo(ticker2, data_inicio, data_fim)
-    
-    # Verificar se precisa converter para BRL
+
     if ticker2.endswith('-USD'):
         print(f"  💱 Detectado ativo em USD, convertendo para BRL...")
-        dados2 = converter_usd_para_brl(dados2, data_inicio, data_fim)
+        dados2 = converter_usd_para_brl(dados2, data_inicio, data_fim, cambio=cambio)
         ticker2_display = ticker2.replace('-USD', '-BRL*')
     else:
         ticker2_display = ticker2
-    
+
     print("\nCalculando variações...")
     var1 = calcular_variacao_percentual(dados1)
     var2 = calcular_variacao_percentual(dados2)
@@ -392,21 +686,30 @@ def plotar_comparacao(ticker1, ticker2, data_inicio, data_fim, autoria=""):
     ax.plot(var2.index, var2.values, label=ticker2_display, linewidth=2, color='#ff7f0e')
     
     # Adicionar sombreamento e anotações
-    for inicio, fim, dias in periodos:
-        ax.axvspan(inicio, fim, alpha=0.2, color='green', zorder=0)
-        
-        # Calcular posição para o texto
-        meio = inicio + (fim - inicio) / 2
-        y_max = max(var1.max(), var2.max())
-        y_pos = y_max * 0.95
-        
-        # Adicionar texto com número de dias
-        ax.text(meio, y_pos, f'{dias}d', 
-                horizontalalignment='center',
-                verticalalignment='top',
-                fontsize=9,
-                bbox=dict(boxstyle='round,pad=0.3', facecolor='white', 
-                         edgecolor='green', alpha=0.7))
+    if periodos:
+        # Uma única PatchCollection desenha todas as faixas em uma só
+        # chamada ao backend, em vez de um Artist axvspan por período
+        x_inicios = mdates.date2num([p[0] for p in periodos])
+        x_fins = mdates.date2num([p[1] for p in periodos])
+        retangulos = [Rectangle((x0, 0), x1 - x0, 1)
+                      for x0, x1 in zip(x_inicios, x_fins)]
+        ax.add_collection(PatchCollection(
+            retangulos, facecolor='green', alpha=0.2, edgecolor='none',
+            zorder=0, transform=ax.get_xaxis_transform()))
+
+        # Rotular no máximo ~20 períodos para não poluir gráficos com
+        # muitas faixas; posição vertical calculada uma única vez
+        passo = max(1, len(periodos) // 20)
+        y_pos = max(var1.values.max(), var2.values.max()) * 0.95
+        meios = (x_inicios + x_fins) / 2
+
+        for i in range(0, len(periodos), passo):
+            ax.text(meios[i], y_pos, f'{periodos[i][2]}d',
+                    horizontalalignment='center',
+                    verticalalignment='top',
+                    fontsize=9,
+                    bbox=dict(boxstyle='round,pad=0.3', facecolor='white',
+                             edgecolor='green', alpha=0.7))
     
     # Adicionar caixa de texto com total de dias
     textstr = f'Total de dias em que {ticker2_display}\nsuperou {ticker1_display}: {total_dias} dias'
@@ -457,36 +760,23 @@ def plotar_comparacao(ticker1, ticker2, data_inicio, data_fim, autoria=""):
     nome_arquivo = f'comparacao_{ticker1_display.replace("*", "")}_vs_{ticker2_display.replace("*", "")}.png'
     nome_arquivo = nome_arquivo.replace('^', '').replace('=', '').replace('/', '_')
     
-    # Tentar salvar em diferentes locais
-    caminhos_salvar = [
-        '/mnt/user-data/outputs/',  # Para servidor Claude
-        './',  # Diretório atual (local)
-    ]
-    
-    salvo = False
-    for caminho in caminhos_salvar:
-        try:
-            import os
-            # Criar diretório se não existir
-            if not os.path.exists(caminho):
-                try:
-                    os.makedirs(caminho, exist_ok=True)
-                except:
-                    continue
-            
-            caminho_completo = os.path.join(caminho, nome_arquivo)
-            plt.savefig(caminho_completo, dpi=300, bbox_inches='tight')
-            print(f"\n✓ Gráfico salvo como: {caminho_completo}")
-            salvo = True
-            break
-        except Exception as e:
-            continue
-    
-    if not salvo:
+    # Resolver o destino uma única vez e salvar uma única vez
+    dir_saida = _resolver_dir_saida()
+    if dir_saida is not None:
+        caminho_completo = os.path.join(dir_saida, nome_arquivo)
+        fig.savefig(caminho_completo, dpi=dpi, bbox_inches='tight')
+        print(f"\n✓ Gráfico salvo como: {caminho_completo}")
+    else:
         print(f"\n⚠️  Não foi possível salvar o gráfico em arquivo")
         print(f"   O gráfico será exibido na tela apenas")
     
-    plt.show()
+    # Exibir apenas em backend interativo; fechar sempre libera os
+    # buffers da figura em execuções em lote
+    if mostrar is None:
+        mostrar = matplotlib.get_backend().lower() not in ('agg', 'svg', 'pdf', 'ps')
+    if mostrar:
+        plt.show()
+    plt.close(fig)
     
     # Calcular duração do período
     dias_totais = (data_fim - data_inicio).days
@@ -498,13 +788,17 @@ def plotar_comparacao(ticker1, ticker2, data_inicio, data_fim, autoria=""):
     print(f"\n📊 RESUMO DA ANÁLISE")
     print(f"{'-'*70}")
     print(f"Período analisado: {periodo_str} ({dias_totais} dias)")
+    # Acessar os escalares uma única vez (cada iloc tem custo de despacho)
+    var1_final = var1.values[-1]
+    var2_final = var2.values[-1]
+
     print(f"\nAtivo 1: {ticker1_display}")
-    print(f"  • Variação total: {var1.iloc[-1]:+.2f}%")
+    print(f"  • Variação total: {var1_final:+.2f}%")
     if ticker1.endswith('-USD'):
         print(f"  • Convertido de USD para BRL usando taxas históricas")
     
     print(f"\nAtivo 2: {ticker2_display}")
-    print(f"  • Variação total: {var2.iloc[-1]:+.2f}%")
+    print(f"  • Variação total: {var2_final:+.2f}%")
     if ticker2.endswith('-USD'):
         print(f"  • Convertido de USD para BRL usando taxas históricas")
     
@@ -514,18 +808,18 @@ def plotar_comparacao(ticker1, ticker2, data_inicio, data_fim, autoria=""):
     print(f"Total de dias de superação: {total_dias} dias")
     
     # Calcular qual ativo teve melhor desempenho geral
-    if var1.iloc[-1] > var2.iloc[-1]:
+    if var1_final > var2_final:
         vencedor = ticker1_display
-        diferenca = var1.iloc[-1] - var2.iloc[-1]
+        diferenca = var1_final - var2_final
     else:
         vencedor = ticker2_display
-        diferenca = var2.iloc[-1] - var1.iloc[-1]
+        diferenca = var2_final - var1_final
     
     print(f"\n🥇 Melhor desempenho geral: {vencedor}")
     print(f"   Diferença: {diferenca:.2f} pontos percentuais")
     print(f"{'='*70}\n")
 
-def plotar_analise_janelas(ticker1, ticker2, periodo_anos, janela_meses, autoria=""):
+def plotar_analise_janelas(ticker1, ticker2, periodo_anos, janela_meses, autoria="", mostrar=None, dpi=300):
     """
     Plota análise de janelas móveis comparando dois ativos
     
@@ -535,7 +829,21 @@ def plotar_analise_janelas(ticker1, ticker2, periodo_anos, janela_meses, autoria
         periodo_anos: Período total de análise em anos
         janela_meses: Tamanho da janela em meses
         autoria: Nome do autor do gráfico (opcional)
+        mostrar: Exibir o gráfico na tela; por padrão, apenas quando o
+            backend do matplotlib for interativo
+        dpi: Resolução do arquivo salvo (use 150 para fluxos apenas de
+            tela; 300 para publicação)
     """
+    # Imports tardios do matplotlib: só os caminhos que plotam pagam o custo
+    import matplotlib
+    if not os.environ.get('MPLBACKEND') and sys.platform.startswith('linux') and not os.environ.get('DISPLAY'):
+        # Em ambientes sem display, o backend Agg evita instanciar GUI
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import matplotlib.dates as mdates
+    from matplotlib.collections import PatchCollection
+    from matplotlib.patches import Rectangle
+
     # Calcular datas - adicionar margem extra para compensar a janela móvel
     # Se queremos analisar 10 anos com janela de 24 meses, precisamos de dados de ~12 anos
     margem_extra_anos = (janela_meses / 12)  # Converter meses em anos
@@ -554,31 +862,38 @@ def plotar_analise_janelas(ticker1, ticker2, periodo_anos, janela_meses, autoria
     print(f"Buscando dados extras para cálculo das janelas...")
     print(f"{'='*70}\n")
     
-    print(f"Obtendo dados para {ticker1}...")
-    dados1 = obter_dados_ativo(ticker1, data_inicio, data_fim)
-    
+    print(f"Obtendo dados para {ticker1} e {ticker2}...")
+    lote = obter_dados_ativos_batch([ticker1, ticker2], data_inicio, data_fim)
+    dados1 = lote[ticker1]
+    dados2 = lote[ticker2]
+    cambio = lote.get('BRL=X')
+
     # Verificar se precisa converter para BRL
     if ticker1.endswith('-USD'):
         print(f"  💱 Detectado ativo em USD, convertendo para BRL...")
-        dados1 = converter_usd_para_brl(dados1, data_inicio, data_fim)
+        dados1 = converter_usd_para_brl(dados1, data_inicio, data_fim, cambio=cambio)
         ticker1_display = ticker1.replace('-USD', '-BRL*')
     else:
         ticker1_display = ticker1
-    
-    print(f"\nObtendo dados para {ticker2}...")
-    dados2 = obter_dados_ativo(ticker2, data_inicio, data_fim)
-    
-    # Verificar se precisa converter para BRL
+
     if ticker2.endswith('-USD'):
         print(f"  💱 Detectado ativo em USD, convertendo para BRL...")
-        dados2 = converter_usd_para_brl(dados2, data_inicio, data_fim)
+        dados2 = converter_usd_para_brl(dados2, data_inicio, data_fim, cambio=cambio)
         ticker2_display = ticker2.replace('-USD', '-BRL*')
     else:
         ticker2_display = ticker2
-    
+
     print("\nCalculando retornos de janelas móveis...")
-    retornos1 = calcular_retorno_janela(dados1, janela_meses)
-    retornos2 = calcular_retorno_janela(dados2, janela_meses)
+    dias_janela = janela_meses * 21
+
+    # A margem extra de dados existe apenas para dar lookback à primeira
+    # janela exibida; recortar os preços para dias_janela pregões antes
+    # do período solicitado evita calcular retornos que seriam descartados
+    pos1 = max(dados1.index.searchsorted(data_inicio_display) - dias_janela, 0)
+    pos2 = max(dados2.index.searchsorted(data_inicio_display) - dias_janela, 0)
+
+    retornos1 = calcular_retorno_janela(dados1.iloc[pos1:], janela_meses)
+    retornos2 = calcular_retorno_janela(dados2.iloc[pos2:], janela_meses)
     
     print(f"  ✓ {len(retornos1)} janelas calculadas para {ticker1_display}")
     print(f"  ✓ {len(retornos2)} janelas calculadas para {ticker2_display}")
@@ -590,19 +905,23 @@ def plotar_analise_janelas(ticker1, ticker2, periodo_anos, janela_meses, autoria
         return
     
     # Filtrar retornos para mostrar apenas o período solicitado
-    retornos1_filtrado = retornos1[retornos1.index >= data_inicio_display]
-    retornos2_filtrado = retornos2[retornos2.index >= data_inicio_display]
+    # O índice é ordenado: searchsorted acha o ponto de corte em O(log N)
+    # e a fatia contígua dispensa a máscara booleana e a cópia
+    retornos1_filtrado = retornos1.iloc[retornos1.index.searchsorted(data_inicio_display):]
+    retornos2_filtrado = retornos2.iloc[retornos2.index.searchsorted(data_inicio_display):]
     
     print(f"  ✓ Filtrando para período solicitado: {len(retornos1_filtrado)} janelas exibidas")
     
+    # Alinhar os retornos filtrados uma única vez: a mesma passada serve
+    # para a detecção de superação e para a plotagem
+    retornos_alinhados = pd.concat([
+        retornos1_filtrado.rename('ret1'),
+        retornos2_filtrado.rename('ret2')
+    ], axis=1).dropna()
+
     print("Identificando janelas de superação...")
-    janelas = encontrar_janelas_superacao(retornos1_filtrado, retornos2_filtrado, janela_meses)
-    
-    # Alinhar retornos para plotagem - usar os retornos filtrados
-    retornos_alinhados = pd.DataFrame({
-        'ret1': retornos1_filtrado,
-        'ret2': retornos2_filtrado
-    }).dropna()
+    janelas = encontrar_janelas_superacao(retornos1_filtrado, retornos2_filtrado, janela_meses,
+                                          retornos_alinhados=retornos_alinhados)
     
     # Criar figura com 3 subplots
     fig = plt.figure(figsize=(18, 12))
@@ -656,8 +975,13 @@ def plotar_analise_janelas(ticker1, ticker2, periodo_anos, janela_meses, autoria
     # Subplot 2: Diferença de retornos
     # Usar os mesmos dados alinhados
     diferenca = retornos_alinhados['ret2'] - retornos_alinhados['ret1']
-    cores_diff = ['green' if d > 0 else 'red' for d in diferenca]
-    ax2.bar(retornos_alinhados.index, diferenca, width=10, color=cores_diff, alpha=0.6, 
+
+    # Paleta RGBA pré-computada (verde/vermelho com alpha 0.6): evita a
+    # comprehension Python e o parse de string de cor por barra
+    cores_diff = np.empty((len(diferenca), 4))
+    cores_diff[:] = (1.0, 0.0, 0.0, 0.6)
+    cores_diff[diferenca.values > 0] = (0.0, 0.5, 0.0, 0.6)
+    ax2.bar(retornos_alinhados.index, diferenca.values, width=10, color=cores_diff,
             edgecolor='none', linewidth=0)
     ax2.axhline(y=0, color='black', linestyle='-', linewidth=1)
     ax2.set_ylabel(f'Diferença de retorno\n{ticker2_display} - {ticker1_display} (pp)', 
@@ -666,12 +990,15 @@ def plotar_analise_janelas(ticker1, ticker2, periodo_anos, janela_meses, autoria
                   fontsize=12, fontweight='bold')
     ax2.grid(True, alpha=0.3, linestyle='--', axis='y')
     
-    # Destacar janelas de superação contínuas
-    for inicio, fim, ret1, ret2 in janelas:
-        # Filtrar apenas as datas dentro desta janela
-        mascara = (retornos_alinhados.index >= inicio) & (retornos_alinhados.index <= fim)
-        if mascara.any():
-            ax2.axvspan(inicio, fim, alpha=0.15, color='green', zorder=0)
+    # Destacar janelas de superação contínuas em uma única coleção
+    if janelas:
+        x_inicios = mdates.date2num([j[0] for j in janelas])
+        x_fins = mdates.date2num([j[1] for j in janelas])
+        retangulos = [Rectangle((x0, 0), x1 - x0, 1)
+                      for x0, x1 in zip(x_inicios, x_fins)]
+        ax2.add_collection(PatchCollection(
+            retangulos, facecolor='green', alpha=0.15, edgecolor='none',
+            zorder=0, transform=ax2.get_xaxis_transform()))
     
     # Subplot 3: Timeline simplificada
     ax3.set_ylim(-0.2, 1.2)
@@ -686,18 +1013,21 @@ def plotar_analise_janelas(ticker1, ticker2, periodo_anos, janela_meses, autoria
     
     # Destacar períodos de superação
     if janelas:
-        for inicio, fim, ret1, ret2 in janelas:
-            ax3.plot([inicio, fim], [0.5, 0.5], color='green', linewidth=12, 
+        # Reutiliza x_inicios/x_fins (em unidades mdates, calculados para
+        # o sombreamento) e deriva meios e durações de forma vetorizada,
+        # em vez de converter Timestamp a Timestamp dentro do loop
+        meios = (x_inicios + x_fins) / 2
+        duracoes_meses = (x_fins - x_inicios) / 30
+
+        for i in range(len(janelas)):
+            ax3.plot([x_inicios[i], x_fins[i]], [0.5, 0.5], color='green', linewidth=12,
                     alpha=0.7, solid_capstyle='round')
-            
+
             # Adicionar marcador no meio
-            meio = inicio + (fim - inicio) / 2
-            duracao_meses = (fim - inicio).days / 30
-            
-            ax3.plot(meio, 0.5, 'o', color='darkgreen', markersize=10, zorder=5)
-            ax3.text(meio, 0.85, f'{duracao_meses:.0f}m', 
+            ax3.plot(meios[i], 0.5, 'o', color='darkgreen', markersize=10, zorder=5)
+            ax3.text(meios[i], 0.85, f'{duracoes_meses[i]:.0f}m',
                     horizontalalignment='center', fontsize=9, fontweight='bold',
-                    bbox=dict(boxstyle='round,pad=0.4', facecolor='lightgreen', 
+                    bbox=dict(boxstyle='round,pad=0.4', facecolor='lightgreen',
                              edgecolor='darkgreen', alpha=0.9))
         
         # Legenda - movida para cima para não sobrepor o eixo
@@ -727,34 +1057,22 @@ def plotar_analise_janelas(ticker1, ticker2, periodo_anos, janela_meses, autoria
     nome_arquivo = f'analise_janelas_{ticker1_display.replace("*", "")}_vs_{ticker2_display.replace("*", "")}_{janela_meses}m.png'
     nome_arquivo = nome_arquivo.replace('^', '').replace('=', '').replace('/', '_')
     
-    # Tentar salvar em diferentes locais
-    caminhos_salvar = [
-        '/mnt/user-data/outputs/',
-        './',
-    ]
-    
-    salvo = False
-    for caminho in caminhos_salvar:
-        try:
-            import os
-            if not os.path.exists(caminho):
-                try:
-                    os.makedirs(caminho, exist_ok=True)
-                except:
-                    continue
-            
-            caminho_completo = os.path.join(caminho, nome_arquivo)
-            plt.savefig(caminho_completo, dpi=300, bbox_inches='tight')
-            print(f"\n✓ Gráfico salvo como: {caminho_completo}")
-            salvo = True
-            break
-        except Exception as e:
-            continue
-    
-    if not salvo:
+    # Resolver o destino uma única vez e salvar uma única vez
+    dir_saida = _resolver_dir_saida()
+    if dir_saida is not None:
+        caminho_completo = os.path.join(dir_saida, nome_arquivo)
+        fig.savefig(caminho_completo, dpi=dpi, bbox_inches='tight')
+        print(f"\n✓ Gráfico salvo como: {caminho_completo}")
+    else:
         print(f"\n⚠️  Não foi possível salvar o gráfico em arquivo")
     
-    plt.show()
+    # Exibir apenas em backend interativo; fechar sempre libera os
+    # buffers da figura em execuções em lote
+    if mostrar is None:
+        mostrar = matplotlib.get_backend().lower() not in ('agg', 'svg', 'pdf', 'ps')
+    if mostrar:
+        plt.show()
+    plt.close(fig)
     
     # Imprimir estatísticas
     print(f"\n{'='*70}")
@@ -770,23 +1088,42 @@ def plotar_analise_janelas(ticker1, ticker2, periodo_anos, janela_meses, autoria
     
     if janelas:
         print(f"\n{ticker2_display} superou {ticker1_display} em {len(janelas)} janelas:\n")
-        
-        for i, (inicio, fim, ret1, ret2) in enumerate(janelas, 1):
-            duracao_dias = (fim - inicio).days
+
+        # Estatísticas vetorizadas: um array estruturado e uma passada
+        # em C, em vez de três varreduras Python sobre as tuplas
+        arr = np.fromiter(
+            ((inicio.timestamp(), fim.timestamp(), ret1, ret2)
+             for inicio, fim, ret1, ret2 in janelas),
+            dtype=[('inicio', 'f8'), ('fim', 'f8'), ('ret1', 'f8'), ('ret2', 'f8')],
+            count=len(janelas)
+        )
+        duracoes_dias = (arr['fim'] - arr['inicio']) / 86400
+        diferencas = arr['ret2'] - arr['ret1']
+
+        # Formatar as datas em lote (strftime vetorizado do DatetimeIndex)
+        # e emitir tudo numa única escrita, em vez de cinco prints e dois
+        # strftime por janela
+        datas_inicio = pd.DatetimeIndex([j[0] for j in janelas]).strftime('%d/%m/%Y')
+        datas_fim = pd.DatetimeIndex([j[1] for j in janelas]).strftime('%d/%m/%Y')
+
+        linhas = []
+        for i in range(len(janelas)):
+            duracao_dias = int(duracoes_dias[i])
             duracao_meses = duracao_dias / 30
-            diferenca = ret2 - ret1
-            
-            print(f"  {i}. {inicio.strftime('%d/%m/%Y')} a {fim.strftime('%d/%m/%Y')}")
-            print(f"     Duração: {duracao_meses:.1f} meses ({duracao_dias} dias)")
-            print(f"     {ticker1_display}: {ret1:+.2f}% | {ticker2_display}: {ret2:+.2f}%")
-            print(f"     {ticker2_display} superou por: {diferenca:+.2f} pontos percentuais")
-            print()
-        
+
+            linhas.append(
+                f"  {i + 1}. {datas_inicio[i]} a {datas_fim[i]}\n"
+                f"     Duração: {duracao_meses:.1f} meses ({duracao_dias} dias)\n"
+                f"     {ticker1_display}: {arr['ret1'][i]:+.2f}% | {ticker2_display}: {arr['ret2'][i]:+.2f}%\n"
+                f"     {ticker2_display} superou por: {diferencas[i]:+.2f} pontos percentuais\n"
+            )
+        print('\n'.join(linhas))
+
         # Estatísticas gerais
-        total_meses = sum((fim - inicio).days / 30 for inicio, fim, _, _ in janelas)
+        total_meses = duracoes_dias.sum() / 30
         media_duracao = total_meses / len(janelas)
-        media_diferenca = sum(ret2 - ret1 for _, _, ret1, ret2 in janelas) / len(janelas)
-        
+        media_diferenca = diferencas.mean()
+
         print(f"📈 ESTATÍSTICAS DAS JANELAS DE SUPERAÇÃO")
         print(f"{'-'*70}")
         print(f"Total de tempo em superação: {total_meses:.1f} meses")
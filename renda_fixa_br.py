@@ -8,8 +8,49 @@ import numpy as np
 import requests
 import os
 import json
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Parquet (via pyarrow) é opcional: o cache carrega sem re-parsear as
+# datas de strings e ocupa ~3x menos disco; sem pyarrow, usa-se CSV
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_DISPONIVEL = True
+except ImportError:
+    PARQUET_DISPONIVEL = False
+
+# orjson é opcional: decodifica as respostas JSON do BCB direto dos
+# bytes, várias vezes mais rápido que o json da stdlib em históricos
+# longos; sem ele, usa-se json.loads normalmente
+try:
+    import orjson
+    ORJSON_DISPONIVEL = True
+except ImportError:
+    ORJSON_DISPONIVEL = False
+
+
+def _decodificar_json(response):
+    """Decodifica o corpo JSON de uma resposta HTTP"""
+    if ORJSON_DISPONIVEL:
+        return orjson.loads(response.content)
+    return json.loads(response.content)
+
+
+def _parse_datas_bcb(datas):
+    """
+    Converte datas do BCB ('dd/mm/aaaa') em datetime64 por fatiamento
+
+    As datas da API têm largura fixa, então reordenar as fatias para o
+    formato ISO ('aaaa-mm-dd') e converter direto para datetime64 evita
+    o parser de formato do pandas, que analisa string por string.
+    """
+    iso = [d[6:10] + '-' + d[3:5] + '-' + d[0:2] for d in datas]
+    return np.array(iso, dtype='datetime64[ns]')
 
 
 class RendaFixaBR:
@@ -39,147 +80,289 @@ class RendaFixaBR:
         }
         
         self.ultima_atualizacao_file = self.cache_dir / 'ultima_atualizacao.json'
-        
+
+        # Timestamps de atualização carregados uma única vez: evita
+        # reler o JSON do disco a cada validação/gravação de cache
+        self._timestamps = {}
+        if self.ultima_atualizacao_file.exists():
+            with open(self.ultima_atualizacao_file, 'r') as f:
+                self._timestamps = json.load(f)
+
+        # Sessão HTTP persistente: reaproveita a conexão TCP/TLS entre os
+        # blocos (uma só negociação TLS) e trata 5xx transientes com
+        # backoff exponencial via urllib3
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=4,
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504])
+        )
+        self._session.mount('https://', adapter)
+        self._session.headers.update({
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
+            "Accept": "*/*",
+            "Connection": "keep-alive",
+            "Referer": "https://www.bcb.gov.br/"
+        })
+
     def _formatar_data_bcb(self, data):
         """Converte datetime para formato do BCB (DD/MM/YYYY)"""
-        return data.strftime('%d/%m/%Y')
+        # f-string direto nos campos: sem o parse do format string nem a
+        # consulta de locale que o strftime faz a cada chamada
+        return f"{data.day:02d}/{data.month:02d}/{data.year:04d}"
     
-    def _buscar_serie_bcb(self, serie_codigo, data_inicio, data_fim):
+    def _planejar_blocos(self, data_inicio, data_fim, janela_anos=5):
         """
-        Busca série temporal do Banco Central (Versão com Paginação de Datas)
-        Resolve o erro de limite de 10 anos do BCB.
+        Divide o período em blocos de até `janela_anos` anos
+
+        O BCB limita cada consulta a 10 anos; blocos de 5 anos ficam com
+        folga e podem ser buscados em paralelo.
         """
-        import urllib3
-        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-        
-        # Lista para armazenar os pedaços dos dados
-        todos_dados = []
-        
-        # Define um tamanho seguro de janela (ex: 5 anos para não bater no limite de 10)
-        janela_anos = 5
-        
+        blocos = []
         data_atual = data_inicio
-        
-        print(f"  📡 Iniciando busca da série {serie_codigo} (fatiada em blocos de {janela_anos} anos)...")
-
         while data_atual < data_fim:
-            # Calcula o fim desta fatia
             fim_fatia = min(data_atual + timedelta(days=365 * janela_anos), data_fim)
-            
-            # Formata datas para log
-            d_ini_str = data_atual.strftime('%d/%m/%Y')
-            d_fim_str = fim_fatia.strftime('%d/%m/%Y')
-            
-            # HEADERS COMPLETOS
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
-                "Accept": "*/*",
-                "Connection": "keep-alive",
-                "Referer": "https://www.bcb.gov.br/"
-            }
-            
-            params = {
-                'formato': 'json',
-                'dataInicial': self._formatar_data_bcb(data_atual),
-                'dataFinal': self._formatar_data_bcb(fim_fatia)
-            }
-            
-            try:
-                url = self.bcb_base_url.format(serie=serie_codigo)
-                
-                # Tenta requisição normal
-                try:
-                    response = requests.get(url, params=params, headers=headers, timeout=30)
-                    response.raise_for_status()
-                except requests.exceptions.RequestException:
-                    print(f"    ⚠️ Falha SSL no bloco {d_ini_str}. Tentando modo inseguro...")
-                    response = requests.get(url, params=params, headers=headers, timeout=30, verify=False)
-                    response.raise_for_status()
-                
-                # Tenta ler o JSON
-                try:
-                    dados = response.json()
-                except json.JSONDecodeError:
-                    print(f"    ❌ Resposta inválida (não JSON) para o período {d_ini_str}-{d_fim_str}")
-                    dados = []
-
-                # Verifica se o JSON é uma lista ou um dicionário de erro
-                if isinstance(dados, dict) and "error" in dados:
-                    print(f"    ❌ Erro da API do BCB: {dados['error']}")
-                elif isinstance(dados, list) and len(dados) > 0:
-                    todos_dados.extend(dados) # Adiciona à lista geral
-                    print(f"    ✓ Bloco {d_ini_str} a {d_fim_str}: {len(dados)} registros.")
-                else:
-                    print(f"    ⚠️ Sem dados para o bloco {d_ini_str} a {d_fim_str}.")
-                    
-            except Exception as e:
-                print(f"    ❌ Erro ao buscar bloco {d_ini_str}: {str(e)}")
-            
+            blocos.append((data_atual, fim_fatia))
             # Avança para o dia seguinte ao fim desta fatia
             data_atual = fim_fatia + timedelta(days=1)
-        
-        # Processar o resultado acumulado
-        if not todos_dados:
+        return blocos
+
+    def _buscar_bloco_bcb(self, serie_codigo, d_ini, d_fim):
+        """Busca um bloco de uma série; devolve a lista de registros"""
+        url = self.bcb_base_url.format(serie=serie_codigo)
+        d_ini_str = self._formatar_data_bcb(d_ini)
+        d_fim_str = self._formatar_data_bcb(d_fim)
+
+        params = {
+            'formato': 'json',
+            'dataInicial': d_ini_str,
+            'dataFinal': d_fim_str
+        }
+
+        try:
+            # Tenta requisição normal (timeout separado: conexão/leitura)
+            try:
+                response = self._session.get(url, params=params, timeout=(5, 30))
+                response.raise_for_status()
+            except requests.exceptions.RequestException:
+                print(f"    ⚠️ Falha SSL no bloco {d_ini_str}. Tentando modo inseguro...")
+                response = self._session.get(url, params=params, timeout=(5, 30), verify=False)
+                response.raise_for_status()
+
+            # Tenta ler o JSON (orjson e json levantam subclasses
+            # de ValueError em corpo inválido)
+            try:
+                dados = _decodificar_json(response)
+            except ValueError:
+                print(f"    ❌ Resposta inválida (não JSON) para o período {d_ini_str}-{d_fim_str}")
+                dados = []
+
+            # Verifica se o JSON é uma lista ou um dicionário de erro
+            if isinstance(dados, dict) and "error" in dados:
+                print(f"    ❌ Erro da API do BCB: {dados['error']}")
+            elif isinstance(dados, list) and len(dados) > 0:
+                print(f"    ✓ Bloco {d_ini_str} a {d_fim_str}: {len(dados)} registros.")
+                return dados
+            else:
+                print(f"    ⚠️ Sem dados para o bloco {d_ini_str} a {d_fim_str}.")
+
+        except Exception as e:
+            print(f"    ❌ Erro ao buscar bloco {d_ini_str}: {str(e)}")
+
+        return []
+
+    def _consolidar_registros(self, datas, valores):
+        """Consolida listas de datas/valores em um DataFrame ordenado"""
+        if not datas:
             print(f"  ⚠️  Nenhum dado retornado em nenhuma das tentativas.")
             return pd.DataFrame()
-            
+
         try:
-            df = pd.DataFrame(todos_dados)
-            # Garantir que as colunas existem antes de processar
-            if 'data' in df.columns and 'valor' in df.columns:
-                df['data'] = pd.to_datetime(df['data'], format='%d/%m/%Y')
-                df['valor'] = pd.to_numeric(df['valor'], errors='coerce')
-                df = df.dropna()
-                df = df.set_index('data')
-                df = df.sort_index()
-                # Remove duplicatas que podem ocorrer na junção das fatias
-                df = df[~df.index.duplicated(keep='first')]
-                print(f"  ✅ Total consolidado: {len(df)} registros obtidos.")
-                return df
-            else:
-                print("  ❌ Formato de dados inesperado após consolidação.")
-                return pd.DataFrame()
-                
+            datas_arr = _parse_datas_bcb(datas)
+            valores_arr = pd.to_numeric(np.asarray(valores, dtype=object),
+                                        errors='coerce')
+
+            # Descartar valores não numéricos
+            validos = ~np.isnan(valores_arr)
+            datas_arr = datas_arr[validos]
+            valores_arr = valores_arr[validos]
+
+            # np.unique ordena e deduplica numa única passada, devolvendo
+            # a primeira ocorrência de cada data (duplicatas podem surgir
+            # na junção das fatias)
+            datas_unicas, primeiras = np.unique(datas_arr, return_index=True)
+            df = pd.DataFrame({'valor': valores_arr[primeiras]},
+                              index=pd.DatetimeIndex(datas_unicas, name='data'),
+                              copy=False)
+            print(f"  ✅ Total consolidado: {len(df)} registros obtidos.")
+            return df
+
         except Exception as e:
             print(f"  ❌ Erro ao processar DataFrame final: {str(e)}")
             return pd.DataFrame()
+
+    def _buscar_series_bcb(self, pedidos):
+        """
+        Busca várias séries do BCB por um único pool de threads
+
+        Todos os blocos de todas as séries entram na mesma fila, de modo
+        que as requisições compartilham as conexões persistentes da
+        sessão e se sobrepõem na espera de rede — uma série lenta não
+        segura o início das demais.
+
+        Args:
+            pedidos: lista de tuplas (nome, serie_codigo, data_inicio, data_fim)
+
+        Returns:
+            Dicionário nome -> DataFrame consolidado
+        """
+        import urllib3
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+        planos = []
+        for nome, serie_codigo, data_inicio, data_fim in pedidos:
+            blocos = self._planejar_blocos(data_inicio, data_fim)
+            print(f"  📡 Iniciando busca da série {serie_codigo} ({len(blocos)} bloco(s) de até 5 anos, em paralelo)...")
+            planos.extend((nome, serie_codigo, bloco) for bloco in blocos)
+
+        # Acumular já em colunas separadas por série — evita o DataFrame
+        # de lista-de-dicts, cuja inferência de tipos percorre todos os
+        # registros em Python
+        acumulado = {nome: ([], []) for nome, _, _, _ in pedidos}
+        if planos:
+            with ThreadPoolExecutor(max_workers=min(4, len(planos))) as executor:
+                resultados = executor.map(
+                    lambda plano: self._buscar_bloco_bcb(plano[1], *plano[2]),
+                    planos
+                )
+                for (nome, _, _), dados_bloco in zip(planos, resultados):
+                    datas, valores = acumulado[nome]
+                    for registro in dados_bloco:
+                        data = registro.get('data')
+                        valor = registro.get('valor')
+                        # Registros sem as chaves esperadas são descartados
+                        if data is None or valor is None:
+                            continue
+                        datas.append(data)
+                        valores.append(valor)
+
+        return {nome: self._consolidar_registros(datas, valores)
+                for nome, (datas, valores) in acumulado.items()}
+
+    def _buscar_serie_bcb(self, serie_codigo, data_inicio, data_fim):
+        """
+        Busca série temporal do Banco Central (Versão com Paginação de Datas)
+        Resolve o erro de limite de 10 anos do BCB.
+        """
+        resultado = self._buscar_series_bcb(
+            [('serie', serie_codigo, data_inicio, data_fim)]
+        )
+        return resultado['serie']
     
-    def _salvar_cache(self, nome, df):
-        """Salva DataFrame em cache"""
-        cache_file = self.cache_dir / f'{nome}.csv'
-        df.to_csv(cache_file)
-        
-        # Atualizar timestamp
-        timestamps = {}
-        if self.ultima_atualizacao_file.exists():
-            with open(self.ultima_atualizacao_file, 'r') as f:
-                timestamps = json.load(f)
-        
-        timestamps[nome] = datetime.now().isoformat()
-        
-        with open(self.ultima_atualizacao_file, 'w') as f:
-            json.dump(timestamps, f, indent=2)
+    def _salvar_cache(self, nome, df, append=False):
+        """
+        Salva DataFrame em cache (Parquet quando disponível)
+
+        Com append=True, grava apenas as linhas recebidas — um novo
+        fragmento do dataset Parquet ou um append no CSV — em vez de
+        reescrever a série inteira a cada atualização.
+        """
+        if PARQUET_DISPONIVEL:
+            dataset = self.cache_dir / nome
+            arquivo_unico = self.cache_dir / f'{nome}.parquet'
+            if not append and dataset.is_dir():
+                for parte in dataset.glob('part-*.parquet'):
+                    parte.unlink()
+            dataset.mkdir(exist_ok=True)
+
+            # Nome de índice uniforme entre fragmentos: esquemas mistos
+            # (índice nomeado num fragmento, anônimo noutro) viram NaT
+            # na leitura do dataset consolidado
+            if df.index.name != 'data':
+                df = df.rename_axis('data')
+
+            if append and arquivo_unico.exists():
+                # Cache no formato antigo de arquivo único: incorporá-lo
+                # ao dataset como primeiro fragmento — num append, df
+                # contém apenas as linhas novas, então descartar o
+                # arquivo aqui perderia todo o histórico
+                # O prefixo numérico garante que o legado ordena antes
+                # de qualquer fragmento com timestamp
+                os.replace(arquivo_unico,
+                           dataset / 'part-00000000-legado.parquet')
+
+            parte = dataset / f'part-{datetime.now().strftime("%Y%m%d%H%M%S%f")}.parquet'
+            df.to_parquet(parte, compression='snappy')
+
+            # No save completo, df já carrega a série inteira: o formato
+            # antigo de arquivo único pode ser removido
+            if not append and arquivo_unico.exists():
+                arquivo_unico.unlink()
+        else:
+            cache_file = self.cache_dir / f'{nome}.csv'
+            if append and cache_file.exists():
+                df.to_csv(cache_file, mode='a', header=False)
+            else:
+                df.to_csv(cache_file)
+
+        # Atualizar timestamp em memória e persistir de forma atômica:
+        # gravar num temporário e trocar com os.replace evita deixar um
+        # JSON truncado se o processo morrer no meio da escrita
+        self._timestamps[nome] = datetime.now().isoformat()
+
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self.cache_dir, suffix='.json.tmp'
+        )
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self._timestamps, f, indent=2)
+            os.replace(tmp_path, self.ultima_atualizacao_file)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
     
     def _carregar_cache(self, nome):
         """Carrega DataFrame do cache"""
-        cache_file = self.cache_dir / f'{nome}.csv'
-        if cache_file.exists():
-            df = pd.read_csv(cache_file, index_col=0, parse_dates=True)
+        dataset = self.cache_dir / nome
+        parquet_file = self.cache_dir / f'{nome}.parquet'
+        csv_file = self.cache_dir / f'{nome}.csv'
+
+        if PARQUET_DISPONIVEL and dataset.is_dir():
+            # Concatenar os fragmentos do mais antigo para o mais novo
+            # (ordem lexicográfica dos nomes) e ordenar de forma estável:
+            # assim, numa data duplicada, keep='last' fica de fato com o
+            # valor gravado por último
+            partes = sorted(dataset.glob('part-*.parquet'))
+            if partes:
+                df = pd.concat([pd.read_parquet(parte) for parte in partes])
+                df = df.sort_index(kind='stable')
+                return df[~df.index.duplicated(keep='last')]
+
+        if PARQUET_DISPONIVEL and parquet_file.exists():
+            # Datas já armazenadas como int64: sem parse de strings no load
+            return pd.read_parquet(parquet_file)
+
+        if csv_file.exists():
+            df = pd.read_csv(csv_file, index_col=0, parse_dates=True)
+            # Migração única do cache legado: regravar como fragmento do
+            # dataset Parquet (mesmo formato dos appends) e remover o CSV
+            if PARQUET_DISPONIVEL:
+                dataset.mkdir(exist_ok=True)
+                df.rename_axis('data').to_parquet(
+                    dataset / 'part-00000000-legado.parquet',
+                    compression='snappy'
+                )
+                csv_file.unlink()
             return df
         return None
     
     def _cache_valido(self, nome, max_dias=7):
         """Verifica se o cache é válido (menos de X dias)"""
-        if not self.ultima_atualizacao_file.exists():
+        if nome not in self._timestamps:
             return False
-        
-        with open(self.ultima_atualizacao_file, 'r') as f:
-            timestamps = json.load(f)
-        
-        if nome not in timestamps:
-            return False
-        
-        ultima_atualizacao = datetime.fromisoformat(timestamps[nome])
+
+        ultima_atualizacao = datetime.fromisoformat(self._timestamps[nome])
         idade = (datetime.now() - ultima_atualizacao).days
         
         return idade < max_dias
@@ -198,12 +381,18 @@ class RendaFixaBR:
         print("\n💰 Obtendo dados do CDI (Certificado de Depósito Interbancário)")
         
         # Verificar cache
-        cache_valido = self._cache_valido('cdi')
-        dados_cache = self._carregar_cache('cdi') if cache_valido else None
-        
-        if dados_cache is not None and cache_valido:
+        dados_cache = self._carregar_cache('cdi')
+
+        # Cobertura total do período pedido: dados históricos não mudam,
+        # então servir direto do cache, mesmo "velho" pela idade — análises
+        # de períodos passados não pagam nenhuma ida à rede
+        if (dados_cache is not None and not dados_cache.empty
+                and dados_cache.index[0].date() <= data_inicio.date()
+                and dados_cache.index[-1].date() >= data_fim.date()):
+            print("  ✓ Cache local cobre todo o período solicitado")
+        elif dados_cache is not None and self._cache_valido('cdi'):
             print("  ✓ Cache local encontrado e válido")
-            
+
             # Verificar se precisa atualizar dados mais recentes
             if dados_cache.index[-1].date() < data_fim.date():
                 print("  📥 Atualizando dados mais recentes...")
@@ -214,7 +403,8 @@ class RendaFixaBR:
                 )
                 if not novos_dados.empty:
                     dados_cache = pd.concat([dados_cache, novos_dados])
-                    self._salvar_cache('cdi', dados_cache)
+                    # Persistir apenas as linhas novas, sem reescrever a série
+                    self._salvar_cache('cdi', novos_dados, append=True)
         else:
             print("  📥 Buscando dados do Banco Central do Brasil...")
             dados_cache = self._buscar_serie_bcb(
@@ -228,38 +418,49 @@ class RendaFixaBR:
         if dados_cache.empty:
             raise ValueError("Não foi possível obter dados do CDI")
         
-        # Filtrar período solicitado
-        mask = (dados_cache.index >= data_inicio) & (dados_cache.index <= data_fim)
-        df_filtrado = dados_cache[mask].copy()
+        # Filtrar período solicitado: o índice é ordenado, então duas
+        # buscas binárias substituem a máscara booleana sobre toda a série
+        pos_ini = dados_cache.index.searchsorted(data_inicio, side='left')
+        pos_fim = dados_cache.index.searchsorted(data_fim, side='right')
+        df_filtrado = dados_cache.iloc[pos_ini:pos_fim]
         
         # Calcular valor acumulado do investimento
         # Assumindo investimento inicial de R$ 100.000
         valor_inicial = 100000
         
-        # CDI é taxa anual, converter para diária
-        df_filtrado['taxa_diaria'] = (1 + df_filtrado['valor'] / 100) ** (1/252) - 1
-        df_filtrado['fator_acumulado'] = (1 + df_filtrado['taxa_diaria']).cumprod()
-        df_filtrado['valor_investimento'] = valor_inicial * df_filtrado['fator_acumulado']
-        
-        # Criar DataFrame compatível com yfinance
-        df_yf = pd.DataFrame(index=df_filtrado.index)
-        df_yf['Open'] = df_filtrado['valor_investimento']
-        df_yf['High'] = df_filtrado['valor_investimento']
-        df_yf['Low'] = df_filtrado['valor_investimento']
-        df_yf['Close'] = df_filtrado['valor_investimento']
-        df_yf['Volume'] = 0
-        df_yf['Adj Close'] = df_filtrado['valor_investimento']
-        
+        # CDI é taxa anual, converter para diária — tudo vetorizado sobre
+        # o ndarray, sem inserir colunas intermediárias no DataFrame
+        # (evita a fragmentação do frame e as alocações por coluna)
+        valores = df_filtrado['valor'].to_numpy(dtype=np.float64)
+        taxa_diaria = np.power(1.0 + valores / 100.0, 1.0 / 252.0) - 1.0
+        # Acumular em espaço log: log1p preserva precisão para taxas
+        # diárias minúsculas e cumsum vetoriza melhor que a cadeia
+        # serial de multiplicações do cumprod
+        fator_acumulado = np.exp(np.cumsum(np.log1p(taxa_diaria)))
+        valor_investimento = valor_inicial * fator_acumulado
+
+        # Criar DataFrame compatível com yfinance em uma única construção;
+        # copy=False compartilha o mesmo buffer entre as colunas OHLC em
+        # vez de alocar seis cópias da série
+        df_yf = pd.DataFrame({
+            'Open': valor_investimento,
+            'High': valor_investimento,
+            'Low': valor_investimento,
+            'Close': valor_investimento,
+            'Volume': np.zeros(len(valor_investimento), dtype=np.int32),
+            'Adj Close': valor_investimento,
+        }, index=df_filtrado.index, copy=False)
+
         # Estatísticas
-        taxa_media = df_filtrado['valor'].mean()
-        taxa_periodo = ((df_filtrado['fator_acumulado'].iloc[-1] - 1) * 100)
-        
+        taxa_media = valores.mean()
+        taxa_periodo = (fator_acumulado[-1] - 1) * 100
+
         print(f"\n  📊 Estatísticas do CDI no período:")
         print(f"     • Taxa média: {taxa_media:.2f}% a.a.")
         print(f"     • Rentabilidade acumulada: {taxa_periodo:.2f}%")
         print(f"     • Dias úteis: {len(df_filtrado)}")
-        print(f"     • Valor final (R$ 100k investidos): R$ {df_filtrado['valor_investimento'].iloc[-1]:,.2f}")
-        
+        print(f"     • Valor final (R$ 100k investidos): R$ {valor_investimento[-1]:,.2f}")
+
         return df_yf
     
     def obter_poupanca(self, data_inicio, data_fim):
@@ -278,15 +479,20 @@ class RendaFixaBR:
         print("            Se SELIC ≤ 8,5% → 70% SELIC + TR")
         
         try:
-            # Obter SELIC
-            print("  📥 Buscando dados da SELIC...")
-            selic = self._buscar_serie_bcb(self.series['SELIC'], data_inicio, data_fim)
+            # SELIC e TR são séries independentes: os blocos das duas
+            # entram juntos na fila do pool compartilhado e as esperas
+            # de rede se sobrepõem
+            print("  📥 Buscando dados da SELIC e da TR...")
+            series = self._buscar_series_bcb([
+                ('selic', self.series['SELIC'], data_inicio, data_fim),
+                ('tr', self.series['TR'], data_inicio, data_fim),
+            ])
+            selic = series['selic']
+            tr = series['tr']
+
             if selic.empty:
                 raise ValueError("Não foi possível obter dados da SELIC")
-            
-            # Obter TR (Taxa Referencial)
-            print("  📥 Buscando dados da TR...")
-            tr = self._buscar_serie_bcb(self.series['TR'], data_inicio, data_fim)
+
             if tr.empty:
                 print("  ⚠️  TR não disponível, assumindo 0%")
                 tr = pd.DataFrame({'valor': 0}, index=selic.index)
@@ -302,9 +508,10 @@ class RendaFixaBR:
             # Preencher valores faltantes
             df = df.fillna(0)
             
-            # Filtrar período solicitado
-            mask = (df.index >= data_inicio) & (df.index <= data_fim)
-            df = df[mask].copy()
+            # Filtrar período solicitado via busca binária no índice ordenado
+            pos_ini = df.index.searchsorted(data_inicio, side='left')
+            pos_fim = df.index.searchsorted(data_fim, side='right')
+            df = df.iloc[pos_ini:pos_fim]
             
             if df.empty:
                 raise ValueError("Nenhum dado disponível para o período solicitado")
@@ -313,38 +520,45 @@ class RendaFixaBR:
             # Poupança rende mensalmente, mas vamos aproximar diariamente
             valor_inicial = 100000
             
-            # Aplicar regra da poupança
-            df['rendimento_mensal'] = df['selic'].apply(
-                lambda x: 0.5 if x > 8.5 else (x * 0.7 / 12)
-            )
-            
+            # Aplicar regra da poupança de forma vetorizada: np.where
+            # substitui o apply com chamada Python por linha
+            selic_arr = df['selic'].to_numpy(dtype=np.float64)
+            tr_arr = df['tr'].to_numpy(dtype=np.float64)
+
+            rendimento_mensal = np.where(selic_arr > 8.5, 0.5, selic_arr * 0.7 / 12.0)
+
             # Adicionar TR (converter para mensal)
-            df['rendimento_total'] = df['rendimento_mensal'] + (df['tr'] / 12)
-            
+            rendimento_total = rendimento_mensal + tr_arr / 12.0
+
             # Calcular acumulado (aproximação diária)
-            df['taxa_diaria'] = df['rendimento_total'] / 30
-            df['fator_acumulado'] = (1 + df['taxa_diaria'] / 100).cumprod()
-            df['valor_investimento'] = valor_inicial * df['fator_acumulado']
-            
-            # Criar DataFrame compatível com yfinance
-            df_yf = pd.DataFrame(index=df.index)
-            df_yf['Open'] = df['valor_investimento']
-            df_yf['High'] = df['valor_investimento']
-            df_yf['Low'] = df['valor_investimento']
-            df_yf['Close'] = df['valor_investimento']
-            df_yf['Volume'] = 0
-            df_yf['Adj Close'] = df['valor_investimento']
-            
+            taxa_diaria = rendimento_total / 30.0
+            # Acumular em espaço log (ver obter_cdi): mais preciso para
+            # taxas pequenas e melhor vetorizado que o cumprod
+            fator_acumulado = np.exp(np.cumsum(np.log1p(taxa_diaria / 100.0)))
+            valor_investimento = valor_inicial * fator_acumulado
+
+            # Criar DataFrame compatível com yfinance em uma única
+            # construção; copy=False compartilha o buffer entre as
+            # colunas OHLC em vez de alocar seis cópias da série
+            df_yf = pd.DataFrame({
+                'Open': valor_investimento,
+                'High': valor_investimento,
+                'Low': valor_investimento,
+                'Close': valor_investimento,
+                'Volume': np.zeros(len(valor_investimento), dtype=np.int32),
+                'Adj Close': valor_investimento,
+            }, index=df.index, copy=False)
+
             # Estatísticas
-            taxa_periodo = ((df['fator_acumulado'].iloc[-1] - 1) * 100)
-            selic_media = df['selic'].mean()
-            
+            taxa_periodo = (fator_acumulado[-1] - 1) * 100
+            selic_media = selic_arr.mean()
+
             print(f"\n  📊 Estatísticas da Poupança no período:")
             print(f"     • SELIC média: {selic_media:.2f}% a.a.")
             print(f"     • Rentabilidade acumulada: {taxa_periodo:.2f}%")
             print(f"     • Dias com dados: {len(df)}")
-            print(f"     • Valor final (R$ 100k investidos): R$ {df['valor_investimento'].iloc[-1]:,.2f}")
-            
+            print(f"     • Valor final (R$ 100k investidos): R$ {valor_investimento[-1]:,.2f}")
+
             return df_yf
             
         except Exception as e:
@@ -355,23 +569,47 @@ class RendaFixaBR:
 
 
 # Função auxiliar para integração fácil
+# Instância compartilhada: reaproveita a sessão HTTP e os timestamps de
+# cache entre chamadas, em vez de recriar tudo a cada ticker
+_rf_compartilhado = None
+
+
+def _obter_rf():
+    global _rf_compartilhado
+    if _rf_compartilhado is None:
+        _rf_compartilhado = RendaFixaBR()
+    return _rf_compartilhado
+
+
+@lru_cache(maxsize=32)
+def _obter_ativo_renda_fixa_cached(ticker, data_inicio_key, data_fim_key):
+    rf = _obter_rf()
+    data_inicio = datetime.fromordinal(data_inicio_key)
+    data_fim = datetime.fromordinal(data_fim_key)
+
+    if ticker == 'RF-CDI':
+        return rf.obter_cdi(data_inicio, data_fim)
+    elif ticker == 'RF-POUPANCA':
+        return rf.obter_poupanca(data_inicio, data_fim)
+    else:
+        raise ValueError(f"Ticker de renda fixa '{ticker}' não reconhecido")
+
+
 def obter_ativo_renda_fixa(ticker, data_inicio, data_fim):
     """
     Função auxiliar para obter dados de renda fixa
-    
+
+    Chamadas repetidas com o mesmo ticker e período (na granularidade de
+    dias) reutilizam o resultado memoizado em memória.
+
     Args:
         ticker: Código do ativo (RF-CDI, RF-POUPANCA, etc.)
         data_inicio: Data inicial
         data_fim: Data final
-        
+
     Returns:
         DataFrame no formato yfinance
     """
-    rf = RendaFixaBR()
-    
-    if ticker == 'RF-CDI':
-        return rf.obter_cdi(data_inicio, data_fim)
-    elif ticker == 'RF-POUPANCA':
-        return rf.obter_poupanca(data_inicio, data_fim)
-    else:
-        raise ValueError(f"Ticker de renda fixa '{ticker}' não reconhecido")
\ No newline at end of file
+    return _obter_ativo_renda_fixa_cached(
+        ticker, data_inicio.toordinal(), data_fim.toordinal()
+    )
\ No newline at end of file